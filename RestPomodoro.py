@@ -5,20 +5,39 @@ import ctypes
 import subprocess
 import winreg as reg
 import os
+import json
+import uuid
+import bisect
+import datetime
+from threading import Event, Lock
+import math
+import wave
+import array
 
 from PyQt5.QtCore import (
-    Qt, QTimer, QThread, pyqtSignal, QEasingCurve, QPropertyAnimation, QSettings,  QPoint
+    Qt, QTimer, QThread, pyqtSignal, QEasingCurve, QPropertyAnimation, QSettings,  QPoint,
+    QStandardPaths, QObject, QRect, QBuffer, QByteArray, QIODevice
 )
 from PyQt5.QtGui import (
-    QIcon, QColor, QPalette, QFont
+    QIcon, QColor, QFont, QPainter, QPixmap
 )
 from PyQt5.QtWidgets import (
     QApplication, QMainWindow, QWidget, QVBoxLayout, QLabel,
     QPushButton, QSlider, QHBoxLayout, QMessageBox, QSystemTrayIcon, QMenu,
     QAction, QGroupBox, QGridLayout, QProgressBar, QGraphicsDropShadowEffect,
-    QGraphicsBlurEffect, QDialog, QCheckBox
+    QGraphicsBlurEffect, QDialog, QCheckBox, QFileDialog, QPlainTextEdit
 )
 
+try:
+    from PyQt5.QtMultimedia import QAudio, QAudioDeviceInfo, QAudioFormat, QAudioOutput
+except ImportError:  # PyQt5 built without QtMultimedia: cues are disabled
+    QAudioOutput = None
+
+try:
+    import numpy as np
+except ImportError:  # Statistics need NumPy
+    np = None
+
 class StartupDialog(QDialog):
     def __init__(self):
         super().__init__()
@@ -90,6 +109,38 @@ def get_idle_duration_windows():
         return millis / 1000.0
     return 0
 
+class PROCESS_MEMORY_COUNTERS(ctypes.Structure):
+    _fields_ = [
+        ('cb', ctypes.c_ulong),
+        ('PageFaultCount', ctypes.c_ulong),
+        ('PeakWorkingSetSize', ctypes.c_size_t),
+        ('WorkingSetSize', ctypes.c_size_t),
+        ('QuotaPeakPagedPoolUsage', ctypes.c_size_t),
+        ('QuotaPagedPoolUsage', ctypes.c_size_t),
+        ('QuotaPeakNonPagedPoolUsage', ctypes.c_size_t),
+        ('QuotaNonPagedPoolUsage', ctypes.c_size_t),
+        ('PagefileUsage', ctypes.c_size_t),
+        ('PeakPagefileUsage', ctypes.c_size_t)
+    ]
+
+def get_process_rss():
+    """
+    Returns the resident set size (working set) of this process in bytes.
+    Uses GetProcessMemoryInfo on Windows and /proc/self/statm on Linux.
+    """
+    if platform.system() == 'Windows':
+        counters = PROCESS_MEMORY_COUNTERS()
+        counters.cb = ctypes.sizeof(counters)
+        process = ctypes.windll.kernel32.GetCurrentProcess()
+        if ctypes.windll.psapi.GetProcessMemoryInfo(process, ctypes.byref(counters), counters.cb):
+            return counters.WorkingSetSize
+        return 0
+    try:
+        with open("/proc/self/statm") as statm:
+            return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError):
+        return 0
+
 # --------------------------------------------------
 # Inactivity Detection Thread
 # --------------------------------------------------
@@ -140,7 +191,7 @@ class InactivityDetectionThread(QThread):
 # --------------------------------------------------
 class TimerThread(QThread):
     tick = pyqtSignal(int)          # Emit remaining seconds each tick
-    phase_completed = pyqtSignal()  # Emit when work/rest phase completes
+    phase_completed = pyqtSignal(float)  # Emit time.perf_counter() when work/rest phase completes
     stopped = pyqtSignal()          # Emit when the timer is manually stopped
 
     def __init__(self, duration, stop_event, parent=None):
@@ -160,21 +211,754 @@ class TimerThread(QThread):
 
         if not self.stop_event.is_set():
             # Phase completed normally
-            self.phase_completed.emit()
+            self.phase_completed.emit(time.perf_counter())
 
 # --------------------------------------------------
-# Rest Popup Window
+# App Data & Event Log
 # --------------------------------------------------
-class RestPopup(QWidget):
-    def __init__(self, rest_duration, parent=None):
+def get_data_directory():
+    """Returns the per-user directory holding the history and other app data."""
+    base = QStandardPaths.writableLocation(QStandardPaths.GenericDataLocation)
+    path = os.path.join(base, "RestTimerApp")
+    os.makedirs(path, exist_ok=True)
+    return path
+
+def log_event(message):
+    """
+    Print a message and append it to RestPomodoro.log in the data directory.
+    The windowed build has no console, so the log file is where users find it.
+    """
+    print(message)
+    try:
+        with open(os.path.join(get_data_directory(), "RestPomodoro.log"), "a", encoding="utf-8") as log_file:
+            log_file.write(f"{time.strftime('%Y-%m-%d %H:%M:%S')} {message}\n")
+    except OSError:
+        pass
+
+# --------------------------------------------------
+# Phase History (Replicated Append-Only Log)
+# --------------------------------------------------
+MIN_RECORDED_SECONDS = 60  # Stopped phases shorter than this made no real progress
+
+class HistoryLog:
+    """
+    Phase history that can be merged across devices without conflicts.
+
+    Each device only appends to its own log (<device_id>.jsonl) and numbers
+    its operations with a per-device sequence number. When a sync folder is
+    set, our new bytes are copied into it and the other devices' logs are
+    read from it. A byte offset per log and the highest sequence number
+    ingested per device mean a sync only parses the tails written since the
+    last one, and duplicates are dropped. The timeline is ordered by time.
+    """
+
+    def __init__(self, device_id, data_dir, sync_dir=None):
+        self.device_id = device_id
+        self.sync_dir = sync_dir or None
+        self.log_path = os.path.join(data_dir, "history", f"{device_id}.jsonl")
+        self.cache_path = os.path.join(data_dir, "history_merged.jsonl")
+        self.state_path = os.path.join(data_dir, "history_state.json")
+        os.makedirs(os.path.dirname(self.log_path), exist_ok=True)
+
+        self.events = []    # Merged timeline, sorted by event_key
+        self.last_seq = {}  # device_id -> highest sequence number ingested
+        self.offsets = {}   # log path -> bytes already ingested
+        self.pushed = {}    # sync folder path -> bytes of our log already copied there
+        self.lock = Lock()  # Guards the above; sync() runs on HistorySyncThread
+
+        self.load()
+
+    @staticmethod
+    def event_key(op):
+        return (op["ts"], op["device"], op["seq"])
+
+    @staticmethod
+    def parse(line):
+        try:
+            op = json.loads(line)
+            if isinstance(op["device"], str) and isinstance(op["seq"], int) and float(op["ts"]) >= 0:
+                return op
+        except (ValueError, KeyError, TypeError):
+            pass
+        return None
+
+    def load(self):
+        """Restore the merged timeline and the sync cursors of the previous session."""
+        try:
+            with open(self.state_path, encoding="utf-8") as state_file:
+                state = json.load(state_file)
+            self.offsets = state.get("offsets", {})
+            self.pushed = state.get("pushed", {})
+        except (OSError, ValueError):
+            pass
+
+        try:
+            with open(self.cache_path, encoding="utf-8") as cache_file:
+                lines = cache_file.readlines()
+        except OSError:
+            lines = []
+            self.offsets = {}  # No cache: re-read every log from the start
+
+        merged = {}
+        for line in lines:
+            op = self.parse(line)
+            if op is None:
+                # Interrupted write: re-read the logs, last_seq skips what we already have
+                self.offsets = {}
+                continue
+            merged[(op["device"], op["seq"])] = op
+            if op["seq"] > self.last_seq.get(op["device"], 0):
+                self.last_seq[op["device"]] = op["seq"]
+        self.events = sorted(merged.values(), key=self.event_key)
+
+    def append(self, kind, outcome, seconds, ended_at=None, idle_seconds=None):
+        """
+        Record the end of a phase in our local log and merge it into the timeline.
+        The sync folder is not touched: HistorySyncThread pushes it later.
+        :param kind: "work" or "rest"
+        :param outcome: "completed", "reset" (inactivity) or "stopped"
+        :param seconds: Time actually spent in the phase.
+        :param idle_seconds: For resets, the idle time already left out of seconds.
+        """
+        ended_at = time.time() if ended_at is None else ended_at
+        with self.lock:
+            seq = self.last_seq.get(self.device_id, 0) + 1
+            op = {
+                "device": self.device_id,
+                "seq": seq,
+                "ts": round(ended_at, 3),
+                "utcoffset": time.localtime(ended_at).tm_gmtoff,
+                "kind": kind,
+                "outcome": outcome,
+                "seconds": int(seconds)
+            }
+            if idle_seconds is not None:
+                op["idle_seconds"] = int(idle_seconds)
+            with open(self.log_path, "a", encoding="utf-8") as log_file:
+                log_file.write(json.dumps(op, separators=(",", ":")) + "\n")
+            self.last_seq[self.device_id] = seq
+            self.merge([op])
+
+    def sync(self):
+        """
+        Push our new operations to the sync folder and merge the new tail of every log.
+        The folder may be a slow or offline share, so this runs on HistorySyncThread
+        (or the command line); the lock is only held while merging.
+        Returns the number of operations added to the timeline.
+        """
+        paths = [self.log_path]
+        sync_dir = self.sync_dir
+        if sync_dir:
+            try:
+                self.push(sync_dir)
+                paths += [
+                    os.path.join(sync_dir, name)
+                    for name in sorted(os.listdir(sync_dir)) if name.endswith(".jsonl")
+                ]
+            except OSError as error:
+                log_event(f"History sync folder unavailable: {error}")
+
+        tails = [self.read_tail(os.path.abspath(path)) for path in paths]
+        with self.lock:
+            new_ops = []
+            for tail in tails:
+                if tail is not None:
+                    new_ops.extend(self.ingest_tail(*tail))
+            self.merge(new_ops)
+            self.save_state()
+        return len(new_ops)
+
+    def merge(self, new_ops):
+        """Insert operations into the sorted timeline and the local cache (lock held)."""
+        if not new_ops:
+            return
+        new_ops.sort(key=self.event_key)
+        if not self.events or self.event_key(new_ops[0]) >= self.event_key(self.events[-1]):
+            self.events.extend(new_ops)
+        else:
+            for op in new_ops:
+                bisect.insort(self.events, op, key=self.event_key)
+        with open(self.cache_path, "a", encoding="utf-8") as cache_file:
+            cache_file.writelines(json.dumps(op, separators=(",", ":")) + "\n" for op in new_ops)
+
+    def read_tail(self, path):
+        """Read the bytes appended to a log since the last sync: (path, offset, data) or None."""
+        offset = self.offsets.get(path, 0)
+        try:
+            size = os.path.getsize(path)
+            if size < offset:
+                offset = 0  # Log was replaced: re-read it, last_seq drops duplicates
+            if size == offset:
+                return None
+            with open(path, "rb") as log_file:
+                log_file.seek(offset)
+                return path, offset, log_file.read(size - offset)
+        except OSError:
+            return None
+
+    def ingest_tail(self, path, offset, data):
+        """Parse the complete lines of a tail, dropping operations we already have (lock held)."""
+        # A partially synced last line is left for the next pass
+        end = data.rfind(b"\n") + 1
+        self.offsets[path] = offset + end
+
+        ops = []
+        for line in data[:end].splitlines():
+            op = self.parse(line)
+            if op is None or op["seq"] <= self.last_seq.get(op["device"], 0):
+                continue
+            self.last_seq[op["device"]] = op["seq"]
+            ops.append(op)
+        return ops
+
+    def push(self, sync_dir):
+        """Copy the part of our log that is not in the sync folder yet."""
+        target = os.path.abspath(os.path.join(sync_dir, os.path.basename(self.log_path)))
+        pushed = self.pushed.get(target, 0)
+        target_size = os.path.getsize(target) if os.path.exists(target) else 0
+        if target_size != pushed:
+            pushed = 0  # Copy is missing or out of step: rewrite it
+        size = os.path.getsize(self.log_path) if os.path.exists(self.log_path) else 0
+        if size == pushed:
+            return
+        with open(self.log_path, "rb") as log_file:
+            log_file.seek(pushed)
+            data = log_file.read(size - pushed)
+        with open(target, "ab" if pushed else "wb") as target_file:
+            target_file.write(data)
+        with self.lock:
+            self.pushed[target] = pushed + len(data)
+
+    def save_state(self):
+        temp_path = self.state_path + ".tmp"
+        with open(temp_path, "w", encoding="utf-8") as state_file:
+            json.dump({"offsets": self.offsets, "pushed": self.pushed}, state_file)
+        os.replace(temp_path, self.state_path)
+
+    def cycles_today(self):
+        """Completed work+rest cycles (finished rest phases) today, across all devices."""
+        midnight = time.mktime(datetime.date.today().timetuple())
+        count = 0
+        with self.lock:
+            for op in reversed(self.events):
+                if op["ts"] < midnight:
+                    break
+                if op["kind"] == "rest" and op["outcome"] == "completed":
+                    count += 1
+        return count
+
+    def streak(self):
+        """
+        Completed cycles since the last interrupted work phase, across all devices.
+        Cutting a rest phase short does not break the streak.
+        """
+        count = 0
+        with self.lock:
+            for op in reversed(self.events):
+                if op["kind"] == "work" and op["outcome"] != "completed":
+                    break
+                if op["kind"] == "rest" and op["outcome"] == "completed":
+                    count += 1
+        return count
+
+class HistorySyncThread(QThread):
+    """Runs HistoryLog.sync() off the GUI thread: periodically and on request."""
+    synced = pyqtSignal(int, float)  # Operations merged, milliseconds taken
+
+    def __init__(self, history, interval=300, parent=None):
+        """
+        :param interval: Seconds between syncs when none is requested.
+        """
         super().__init__(parent)
-        self.rest_duration = rest_duration
-        self.initUI()
+        self.history = history
+        self._interval = interval
+        self._running = True
+        self._wake = Event()
 
-    def initUI(self):
-        # Make the popup full screen
-        self.resize(800, 600)  # Width: 800, Height: 600
-        
+    def run(self):
+        while self._running:
+            started = time.perf_counter()
+            try:
+                added = self.history.sync()
+            except OSError as error:
+                log_event(f"History sync failed: {error}")
+                added = 0
+            if added:
+                self.synced.emit(added, (time.perf_counter() - started) * 1000)
+            self._wake.wait(self._interval)
+            self._wake.clear()
+
+    def request_sync(self):
+        self._wake.set()
+
+    def stop(self):
+        self._running = False
+        self._wake.set()
+
+# --------------------------------------------------
+# Focus Analytics (Columnar History)
+# --------------------------------------------------
+class FocusAnalytics:
+    """
+    Focus reports over the merged phase history.
+    The history is kept as memory-mapped NumPy columns (.npy) next to the
+    merged log. Each load only converts the tail appended since the last
+    one, and every report is a few vectorized passes over the columns.
+    """
+    KINDS = {"work": 0, "rest": 1}
+    OUTCOMES = {"completed": 0, "reset": 1, "stopped": 2}
+    COLUMNS = {
+        "ts": "float64",       # Phase end (UTC epoch seconds)
+        "utcoffset": "int32",  # Local UTC offset when the phase ended
+        "seconds": "int32",    # Time spent in the phase
+        "kind": "int8",
+        "outcome": "int8"
+    }
+    SESSION_BINS_MINUTES = (0, 5, 10, 15, 20, 25, 30, 45, 60, 90, 120)
+    FORMAT = 3  # Bump to rebuild the columns when conversion rules change
+    WEEKDAYS = ("Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun")
+
+    def __init__(self, data_dir):
+        if np is None:
+            raise RuntimeError("Statistics require NumPy (pip install numpy).")
+        self.history_path = os.path.join(data_dir, "history_merged.jsonl")
+        self.column_dir = os.path.join(data_dir, "analytics")
+        self.meta_path = os.path.join(self.column_dir, "columns.json")
+        os.makedirs(self.column_dir, exist_ok=True)
+        self.columns = self.load_columns()
+
+    def column_path(self, name):
+        return os.path.join(self.column_dir, f"{name}.npy")
+
+    def load_columns(self):
+        """Memory-map the columns, converting any history appended since the last load."""
+        try:
+            with open(self.meta_path, encoding="utf-8") as meta_file:
+                meta = json.load(meta_file)
+            converted_bytes, rows = meta["bytes"], meta["rows"]
+            if meta.get("format") != self.FORMAT:
+                converted_bytes = 0
+        except (OSError, ValueError, KeyError):
+            meta, converted_bytes, rows = {}, 0, 0
+        size = os.path.getsize(self.history_path) if os.path.exists(self.history_path) else 0
+
+        columns = None
+        if converted_bytes and converted_bytes <= size:
+            try:
+                columns = {name: np.load(self.column_path(name), mmap_mode="r") for name in self.COLUMNS}
+                if any(len(column) != rows for column in columns.values()):
+                    columns = None  # Interrupted save: rebuild
+            except (OSError, ValueError):
+                columns = None
+        if columns is None:
+            converted_bytes = 0
+        last_seq = meta.get("last_seq", {}) if columns is not None else {}
+
+        if size > converted_bytes:
+            with open(self.history_path, "rb") as history_file:
+                history_file.seek(converted_bytes)
+                data = history_file.read(size - converted_bytes)
+            end = data.rfind(b"\n") + 1
+            parsed = [op for op in map(HistoryLog.parse, data[:end].splitlines()) if op is not None]
+            parsed.sort(key=lambda op: (op["device"], op["seq"]))
+            ops = []
+            for op in parsed:
+                # The app and --stats may both merge the same tail into the log: keep one copy
+                if op["seq"] <= last_seq.get(op["device"], 0):
+                    continue
+                last_seq[op["device"]] = op["seq"]
+                # Skip interruptions without progress: short stops, and the resets older
+                # versions logged every 5 s while idle (real resets carry idle_seconds)
+                if (op.get("outcome") == "stopped" or (op.get("outcome") == "reset" and "idle_seconds" not in op)) \
+                        and op.get("seconds", 0) < MIN_RECORDED_SECONDS:
+                    continue
+                ops.append(op)
+            if ops:
+                tail = {
+                    "ts": [op["ts"] for op in ops],
+                    "utcoffset": [op.get("utcoffset", 0) for op in ops],
+                    "seconds": [op.get("seconds", 0) for op in ops],
+                    "kind": [self.KINDS.get(op.get("kind"), -1) for op in ops],
+                    "outcome": [self.OUTCOMES.get(op.get("outcome"), -1) for op in ops]
+                }
+                merged = {
+                    name: np.concatenate([columns[name], np.asarray(tail[name], dtype=dtype)])
+                    if columns is not None else np.asarray(tail[name], dtype=dtype)
+                    for name, dtype in self.COLUMNS.items()
+                }
+                columns = None  # Release the old mappings before overwriting the files
+                for name, column in merged.items():
+                    np.save(self.column_path(name), column)
+                rows = len(merged["ts"])
+            elif columns is None:
+                rows = 0
+            converted_bytes += end
+            if rows:
+                with open(self.meta_path, "w", encoding="utf-8") as meta_file:
+                    json.dump(
+                        {"format": self.FORMAT, "bytes": converted_bytes, "rows": rows, "last_seq": last_seq},
+                        meta_file
+                    )
+                columns = {name: np.load(self.column_path(name), mmap_mode="r") for name in self.COLUMNS}
+
+        if columns is None:
+            columns = {name: np.empty(0, dtype=dtype) for name, dtype in self.COLUMNS.items()}
+        return columns
+
+    def local_start(self):
+        """Local wall-clock start of every phase, in seconds since the epoch."""
+        c = self.columns
+        return (c["ts"] + c["utcoffset"] - c["seconds"]).astype("int64")
+
+    def hour_of_week_heatmap(self):
+        """7x24 matrix of work minutes by local weekday (Monday first) and starting hour."""
+        work = self.columns["kind"] == self.KINDS["work"]
+        start = self.local_start()[work]
+        days, seconds_of_day = np.divmod(start, 86400)
+        weekday = (days + 3) % 7  # 1970-01-01 was a Thursday
+        slot = weekday * 24 + seconds_of_day // 3600
+        minutes = np.bincount(slot, weights=self.columns["seconds"][work], minlength=168) / 60
+        return minutes.reshape(7, 24)
+
+    def session_length_distribution(self):
+        """Number of work sessions per length bucket (minutes), the last bucket open-ended."""
+        work = self.columns["kind"] == self.KINDS["work"]
+        edges = np.append(np.asarray(self.SESSION_BINS_MINUTES, dtype="float64"), np.inf)
+        counts, _ = np.histogram(self.columns["seconds"][work] / 60, bins=edges)
+        return counts
+
+    def resets_by_hour(self):
+        """Number of inactivity resets per local hour of day."""
+        c = self.columns
+        reset = c["outcome"] == self.OUTCOMES["reset"]
+        local_end = (c["ts"][reset] + c["utcoffset"][reset]).astype("int64")
+        return np.bincount((local_end % 86400) // 3600, minlength=24)
+
+    def work_rest_trend(self, weeks=12):
+        """
+        Work and rest hours per week (Monday first) for the last weeks with history.
+        Returns (week_start_days, work_hours, rest_hours, ratio); ratio is NaN without rest.
+        """
+        c = self.columns
+        week = (self.local_start() // 86400 + 3) // 7  # 1970-01-05 (a Monday) starts week 1
+        if not len(week):
+            empty = np.empty(0)
+            return empty, empty, empty, empty
+        first = max(week.min(), week.max() - weeks + 1)
+        recent = week >= first
+        index = week[recent] - first
+        length = week.max() - first + 1
+        seconds = c["seconds"][recent]
+        kind = c["kind"][recent]
+        work = np.bincount(index, weights=seconds * (kind == self.KINDS["work"]), minlength=length) / 3600
+        rest = np.bincount(index, weights=seconds * (kind == self.KINDS["rest"]), minlength=length) / 3600
+        with np.errstate(divide="ignore", invalid="ignore"):
+            ratio = np.where(rest > 0, work / rest, np.nan)
+        week_start_days = (np.arange(first, first + length) * 7) - 3
+        return week_start_days, work, rest, ratio
+
+    def format_report(self):
+        """Plain-text report used by the Statistics window and the --stats command line."""
+        started = time.perf_counter()
+        c = self.columns
+        heatmap = self.hour_of_week_heatmap()
+        sessions = self.session_length_distribution()
+        resets = self.resets_by_hour()
+        week_days, work_hours, rest_hours, ratio = self.work_rest_trend()
+        completed_cycles = np.count_nonzero(
+            (c["kind"] == self.KINDS["rest"]) & (c["outcome"] == self.OUTCOMES["completed"])
+        )
+        elapsed_ms = (time.perf_counter() - started) * 1000
+
+        lines = [
+            f"Phases recorded: {len(c['ts'])}    Completed cycles: {completed_cycles}",
+            "",
+            "Work minutes by hour of week (00-23h)"
+        ]
+        shades = " .:-=+*#%@"
+        peak = heatmap.max() if heatmap.size else 0
+        levels = (heatmap / peak * (len(shades) - 1)).round().astype(int) if peak else np.zeros((7, 24), int)
+        for name, row in zip(self.WEEKDAYS, levels):
+            lines.append(f"  {name} |{''.join(shades[level] for level in row)}|")
+        lines.append(f"  peak {peak:.0f} min per slot")
+
+        lines += ["", "Work session lengths (minutes)"]
+        bounds = self.SESSION_BINS_MINUTES
+        for i, count in enumerate(sessions):
+            label = f"{bounds[i]}-{bounds[i + 1]}" if i + 1 < len(bounds) else f"{bounds[i]}+"
+            lines.append(f"  {label:>7}: {count}")
+
+        lines += ["", "Inactivity resets by hour of day"]
+        reset_hours = " ".join(f"{hour:02}h:{count}" for hour, count in enumerate(resets) if count)
+        lines.append(f"  {reset_hours or 'none'}")
+
+        lines += ["", "Weekly work/rest (hours)"]
+        for day, work, rest, week_ratio in zip(week_days, work_hours, rest_hours, ratio):
+            week_start = datetime.date(1970, 1, 1) + datetime.timedelta(days=int(day))
+            ratio_text = "-" if np.isnan(week_ratio) else f"{week_ratio:.1f}"
+            lines.append(f"  {week_start}: work {work:6.1f}  rest {rest:5.1f}  ratio {ratio_text}")
+
+        lines += ["", f"Computed in {elapsed_ms:.1f} ms."]
+        return "\n".join(lines)
+
+class StatisticsThread(QThread):
+    """
+    Loads the columns and formats the report off the GUI thread: the first
+    conversion of a long history takes seconds.
+    """
+    report_ready = pyqtSignal(str)
+
+    def __init__(self, data_dir):
+        # Owned by the application, so closing the dialog does not destroy a running thread
+        super().__init__(QApplication.instance())
+        self.data_dir = data_dir
+        self.finished.connect(self.deleteLater)
+
+    def run(self):
+        try:
+            report = FocusAnalytics(self.data_dir).format_report()
+        except (RuntimeError, OSError, ValueError) as error:
+            report = f"Statistics unavailable: {error}"
+        self.report_ready.emit(report)
+
+class StatisticsDialog(QDialog):
+    def __init__(self, data_dir, parent=None):
+        super().__init__(parent)
+        self.data_dir = data_dir
+        self.loading = False
+        self.refresh_pending = False
+        self.setWindowTitle("Statistics")
+        self.resize(560, 620)
+
+        layout = QVBoxLayout()
+        self.report_view = QPlainTextEdit()
+        self.report_view.setReadOnly(True)
+        self.report_view.setFont(QFont("Consolas, monospace", 10))
+
+        buttons_layout = QHBoxLayout()
+        refresh_button = QPushButton("Refresh")
+        refresh_button.clicked.connect(self.refresh)
+        close_button = QPushButton("Close")
+        close_button.clicked.connect(self.close)
+        buttons_layout.addWidget(refresh_button)
+        buttons_layout.addWidget(close_button)
+
+        layout.addWidget(self.report_view)
+        layout.addLayout(buttons_layout)
+        self.setLayout(layout)
+        self.refresh()
+
+    def refresh(self):
+        if self.loading:
+            self.refresh_pending = True  # Run again once the current load is done
+            return
+        self.loading = True
+        if not self.report_view.toPlainText():
+            self.report_view.setPlainText("Loading statistics...")
+        thread = StatisticsThread(self.data_dir)
+        thread.report_ready.connect(self.show_report)
+        thread.start()
+
+    def show_report(self, report):
+        self.report_view.setPlainText(report)
+        self.loading = False
+        if self.refresh_pending:
+            self.refresh_pending = False
+            self.refresh()
+
+def attach_parent_console():
+    """
+    The windowed build starts without stdout. Attach to the console that
+    launched it, if any, so `RestPomodoro.exe --stats` prints there.
+    """
+    if platform.system() == 'Windows' and ctypes.windll.kernel32.AttachConsole(-1):  # ATTACH_PARENT_PROCESS
+        sys.stdout = open("CONOUT$", "w", encoding="utf-8")
+        sys.stderr = sys.stdout
+
+def run_stats_command(args):
+    """
+    Command line: RestPomodoro --stats [OUTPUT_FILE]
+    Syncs the history with the other devices (best effort), then prints the report or
+    writes it to OUTPUT_FILE. Without a console and without OUTPUT_FILE the
+    report goes to statistics.txt in the data directory.
+    Returns the process exit code.
+    """
+    data_dir = get_data_directory()
+    settings = QSettings("RestTimerApp", "Settings")
+    device_id = settings.value("device_id", "", type=str)
+    if device_id:
+        try:
+            history = HistoryLog(device_id, data_dir, settings.value("sync_directory", "", type=str))
+            history.sync()
+        except OSError as error:
+            # E.g. racing the running app on history_state.json: report from local data
+            log_event(f"History sync failed: {error}")
+
+    try:
+        report, status = FocusAnalytics(data_dir).format_report(), 0
+    except RuntimeError as error:
+        report, status = str(error), 1
+
+    output_path = args[0] if args and not args[0].startswith("-") else None
+    if output_path is None:
+        if sys.stdout is None:
+            attach_parent_console()
+        if sys.stdout is None:
+            output_path = os.path.join(data_dir, "statistics.txt")
+        else:
+            print(report)
+            return status
+    with open(output_path, "w", encoding="utf-8") as output_file:
+        output_file.write(report + "\n")
+    return status
+
+# --------------------------------------------------
+# Sound Cues
+# --------------------------------------------------
+def write_chime_wav(path, frequencies, note_length=0.18, sample_rate=44100):
+    """Synthesize a short chime (one decaying sine note per frequency) as a 16-bit mono WAV."""
+    samples = array.array("h")
+    note_samples = int(note_length * sample_rate)
+    for frequency in frequencies:
+        for i in range(note_samples):
+            envelope = math.exp(-6.0 * i / note_samples)
+            samples.append(int(12000 * envelope * math.sin(2 * math.pi * frequency * i / sample_rate)))
+    with wave.open(path, "wb") as wav_file:
+        wav_file.setnchannels(1)
+        wav_file.setsampwidth(2)
+        wav_file.setframerate(sample_rate)
+        wav_file.writeframes(samples.tobytes())
+
+class CueLoaderThread(QThread):
+    """Synthesizes missing cue files and decodes them off the GUI thread."""
+    loaded = pyqtSignal(str, int, int, int, bytes)  # Name, sample rate, channels, sample width, PCM samples
+    failed = pyqtSignal(str, str)                   # Name, error message
+
+    def __init__(self, sound_dir, cues, parent=None):
+        super().__init__(parent)
+        self.sound_dir = sound_dir
+        self.cues = cues
+
+    def run(self):
+        for name, frequencies in self.cues.items():
+            path = os.path.join(self.sound_dir, f"{name}.wav")
+            try:
+                os.makedirs(self.sound_dir, exist_ok=True)
+                if not os.path.exists(path):
+                    write_chime_wav(path, frequencies)
+                with wave.open(path, "rb") as wav_file:
+                    self.loaded.emit(
+                        name, wav_file.getframerate(), wav_file.getnchannels(),
+                        wav_file.getsampwidth(), wav_file.readframes(wav_file.getnframes())
+                    )
+            except (OSError, EOFError, wave.Error) as error:
+                self.failed.emit(name, str(error))
+
+class SoundCuePlayer(QObject):
+    """
+    Plays the chimes marking an automatic switch to a rest or work phase.
+    Cues are decoded at startup by a CueLoaderThread into in-memory PCM
+    buffers, each with its own QAudioOutput. The output opens its device once and is then kept suspended
+    between cues, so play() only rewinds a buffer and resumes an open device;
+    the device pulls the samples without blocking the GUI thread.
+    Drop your own 16-bit PCM rest.wav / work.wav into the sounds folder to replace them.
+    """
+    CUES = {
+        "rest": (783.99, 659.25, 523.25),  # G5 E5 C5, descending
+        "work": (523.25, 659.25, 783.99)   # C5 E5 G5, ascending
+    }
+    LATENCY_BUDGET_MS = 20
+    TAIL_SILENCE_US = 100000  # Pausing on IdleState must not clip the last audible samples
+
+    def __init__(self, sound_dir, enabled=True, parent=None):
+        super().__init__(parent)
+        self.enabled = enabled
+        self.cues = {}  # name -> (QAudioOutput, QBuffer), filled in as the loader delivers them
+        self.transition_at = {}
+        self.last_latency_ms = None
+        self.loader = None
+
+        if QAudioOutput is None:
+            print("QtMultimedia is not available: sound cues are disabled.")
+            return
+
+        self.loader = CueLoaderThread(sound_dir, self.CUES, self)
+        self.loader.loaded.connect(self.add_cue)
+        self.loader.failed.connect(lambda name, error: log_event(f"Sound cue '{name}' disabled: {error}"))
+        self.loader.start()
+
+    def add_cue(self, name, sample_rate, channels, sample_width, samples):
+        """Create a pre-warmed output for decoded samples (on the GUI thread, which owns the outputs)."""
+        audio_format = QAudioFormat()
+        audio_format.setSampleRate(sample_rate)
+        audio_format.setChannelCount(channels)
+        audio_format.setSampleSize(sample_width * 8)
+        audio_format.setCodec("audio/pcm")
+        audio_format.setByteOrder(QAudioFormat.LittleEndian)
+        audio_format.setSampleType(QAudioFormat.UnSignedInt if sample_width == 1 else QAudioFormat.SignedInt)
+        if not QAudioDeviceInfo.defaultOutputDevice().isFormatSupported(audio_format):
+            log_event(f"Sound cue '{name}' disabled: the audio device does not support its format")
+            return
+
+        buffer = QBuffer(self)
+        buffer.setData(QByteArray(samples + bytes(audio_format.bytesForDuration(self.TAIL_SILENCE_US))))
+        buffer.open(QIODevice.ReadOnly)
+        output = QAudioOutput(audio_format, self)
+        output.setVolume(0.6)
+        output.stateChanged.connect(lambda state, name=name: self.handle_state_changed(name, state))
+
+        # Pre-warm: open the device now with nothing to play, then keep it suspended
+        buffer.seek(buffer.size())
+        output.start(buffer)
+        output.suspend()
+        self.cues[name] = (output, buffer)
+
+    def play(self, name, transition_at=None):
+        """
+        :param transition_at: time.perf_counter() when the phase ended, for the latency report.
+        """
+        cue = self.cues.get(name)
+        if not self.enabled or cue is None:
+            return  # Disabled, or still loading: skip rather than wait
+        output, buffer = cue
+        buffer.seek(0)
+        self.transition_at[name] = time.perf_counter() if transition_at is None else transition_at
+        if output.state() == QAudio.StoppedState:
+            output.start(buffer)  # Device was lost (e.g. default output changed): reopen it
+        else:
+            output.resume()
+
+    def handle_state_changed(self, name, state):
+        """
+        Report the cue latency when its output goes active. This covers the
+        queued signal from TimerThread and resuming the already open device;
+        the device's own buffering latency is not included.
+        """
+        if state == QAudio.ActiveState:
+            transition_at = self.transition_at.pop(name, None)
+            if transition_at is not None:
+                self.last_latency_ms = (time.perf_counter() - transition_at) * 1000
+                message = f"Sound cue '{name}': output started {self.last_latency_ms:.1f} ms after the phase ended."
+                if self.last_latency_ms > self.LATENCY_BUDGET_MS:
+                    message = f"WARNING: {message} Over the {self.LATENCY_BUDGET_MS} ms budget."
+                log_event(message)
+        elif state == QAudio.IdleState:
+            self.cues[name][0].suspend()  # Buffer played out: pause, keeping the device open
+
+# --------------------------------------------------
+# Rest Overlay (All Screens)
+# --------------------------------------------------
+class RestPopup(QWidget):
+    """
+    Covers one screen during a break. It has no layout or labels of its own:
+    it paints the frame its RestOverlay rendered for the current tick.
+    """
+    def __init__(self, overlay, screen):
+        super().__init__()
+        self.overlay = overlay
+        self.initUI(screen)
+
+    def initUI(self, screen):
         # Set window flags to stay on top and disable interaction with underlying windows
         self.setWindowFlags(
             Qt.WindowStaysOnTopHint |
@@ -184,63 +968,139 @@ class RestPopup(QWidget):
 
         # Semi-transparent background
         self.setWindowOpacity(0.9)
-        palette = self.palette()
-        palette.setColor(QPalette.Window, QColor(0, 0, 0, 160))  # Semi-transparent black
-        self.setPalette(palette)
-        self.setAutoFillBackground(True)
 
-        # Layout
-        layout = QVBoxLayout()
-        self.setLayout(layout)
+        # Cover the whole screen, following it if its geometry changes
+        self.winId()  # Create the native window so it can be placed on the screen
+        self.windowHandle().setScreen(screen)
+        self.setGeometry(screen.geometry())
+        screen.geometryChanged.connect(self.setGeometry)
+
+    def frame_rect(self):
+        """Where the shared frame is drawn: centred, at its logical size."""
+        width, height = self.overlay.FRAME_WIDTH, self.overlay.FRAME_HEIGHT
+        return QRect((self.width() - width) // 2, (self.height() - height) // 2, width, height)
+
+    def paintEvent(self, event):
+        # Only the damaged area is filled: on a tick that is just the frame rect
+        painter = QPainter(self)
+        painter.fillRect(event.rect(), QColor(0, 0, 0))  # Window opacity lets the desktop show through
+        if not self.overlay.frame.isNull():
+            painter.drawPixmap(self.frame_rect().topLeft(), self.overlay.frame)
+        painter.end()
 
-        # Rest Message
-        message = QLabel("Time to Rest!", self)
-        message.setAlignment(Qt.AlignCenter)
-        message.setStyleSheet("""
-            color: white;
-            font-size: 48px;
-            font-weight: bold;
-        """)
+    def keyPressEvent(self, event):
+        # Disable key presses to prevent closing
+        pass
 
-        # Countdown Label
-        self.countdown_label = QLabel(self.format_time(self.rest_duration * 60), self)
-        self.countdown_label.setAlignment(Qt.AlignCenter)
-        self.countdown_label.setStyleSheet("""
-            color: white;
-            font-size: 36px;
-        """)
+    def mousePressEvent(self, event):
+        # Disable mouse clicks to prevent closing
+        pass
+
+class RestOverlay(QObject):
+    """
+    Full-screen rest overlay on every screen.
+    The message and countdown are rendered once per tick into a shared
+    QPixmap that each per-screen RestPopup paints, so N monitors cost one
+    text render per second instead of N layouts. Screens added or removed
+    during a break gain or lose their window.
+    """
+    FRAME_WIDTH = 800
+    FRAME_HEIGHT = 240
+
+    def __init__(self, rest_duration, parent=None):
+        super().__init__(parent)
+        self.remaining_seconds = rest_duration * 60
+        self.windows = {}  # QScreen -> RestPopup
+        self.frame = QPixmap()
+        self.visible = False
 
-        layout.addStretch()
-        layout.addWidget(message)
-        layout.addWidget(self.countdown_label)
-        layout.addStretch()
+        self.message_font = QFont()
+        self.message_font.setPixelSize(48)
+        self.message_font.setBold(True)
+        self.countdown_font = QFont()
+        self.countdown_font.setPixelSize(36)
 
         # Timer to update countdown
         self.timer = QTimer(self)
         self.timer.timeout.connect(self.update_countdown)
-        self.timer.start(1000)  # Update every second
-
-        self.remaining_seconds = self.rest_duration * 60
 
     def format_time(self, seconds):
         minutes, secs = divmod(seconds, 60)
         return f"{minutes:02}:{secs:02}"
 
+    def show(self):
+        if self.visible:
+            return
+        app = QApplication.instance()
+        app.screenAdded.connect(self.add_screen)
+        app.screenRemoved.connect(self.remove_screen)
+        self.visible = True
+        for screen in app.screens():
+            self.add_screen(screen)
+        self.timer.start(1000)  # Update every second
+
+    def isVisible(self):
+        return self.visible
+
+    def close(self):
+        if not self.visible:
+            return
+        self.visible = False
+        self.timer.stop()
+        app = QApplication.instance()
+        app.screenAdded.disconnect(self.add_screen)
+        app.screenRemoved.disconnect(self.remove_screen)
+        for screen in list(self.windows):
+            self.remove_screen(screen)
+
+    def add_screen(self, screen):
+        if screen in self.windows:
+            return
+        window = RestPopup(self, screen)
+        self.windows[screen] = window
+        self.render_frame()  # The new screen may need a sharper frame
+        window.show()
+
+    def remove_screen(self, screen):
+        window = self.windows.pop(screen, None)
+        if window is not None:
+            screen.geometryChanged.disconnect(window.setGeometry)
+            window.close()
+            window.deleteLater()
+
+    def render_frame(self):
+        """Render the message and countdown once, at the sharpest pixel ratio in use."""
+        ratio = max((screen.devicePixelRatio() for screen in self.windows), default=1.0)
+        if self.frame.isNull() or self.frame.devicePixelRatio() != ratio:
+            self.frame = QPixmap(int(self.FRAME_WIDTH * ratio), int(self.FRAME_HEIGHT * ratio))
+            self.frame.setDevicePixelRatio(ratio)
+        self.frame.fill(Qt.transparent)
+
+        half_height = self.FRAME_HEIGHT // 2
+        painter = QPainter(self.frame)
+        painter.setRenderHint(QPainter.TextAntialiasing)
+        painter.setPen(QColor("white"))
+        painter.setFont(self.message_font)
+        painter.drawText(
+            QRect(0, 0, self.FRAME_WIDTH, half_height),
+            Qt.AlignHCenter | Qt.AlignBottom, "Time to Rest!"
+        )
+        painter.setFont(self.countdown_font)
+        painter.drawText(
+            QRect(0, half_height, self.FRAME_WIDTH, half_height),
+            Qt.AlignHCenter | Qt.AlignTop, self.format_time(self.remaining_seconds)
+        )
+        painter.end()
+
+        for window in self.windows.values():
+            window.update(window.frame_rect())
+
     def update_countdown(self):
         self.remaining_seconds -= 1
         if self.remaining_seconds >= 0:
-            self.countdown_label.setText(self.format_time(self.remaining_seconds))
+            self.render_frame()
         else:
-            self.timer.stop()
-            self.close()  # Close the popup when rest time is over
-
-    def keyPressEvent(self, event):
-        # Disable key presses to prevent closing
-        pass
-
-    def mousePressEvent(self, event):
-        # Disable mouse clicks to prevent closing
-        pass
+            self.close()  # Close the overlay when rest time is over
 
 # --------------------------------------------------
 # Main Application Window
@@ -262,13 +1122,44 @@ class RestTimerApp(QMainWindow):
         self.work_duration = self.settings.value("work_duration", 25, type=int)
         self.rest_duration = self.settings.value("rest_duration", 5, type=int)
 
+        # Tray-only mode: seconds hidden before the window's widgets are released (0 disables)
+        self.ui_teardown_delay = self.settings.value("ui_teardown_delay", 60, type=int)
+
         # Timer states
         self.is_work_phase = True
         self.timer_running = False
+        self.phase_seconds = 0
+        self.remaining_seconds = None  # None while the timer is stopped
+
+        self.phase_started_at = None  # Wall-clock start of the phase being timed
+
+        # Phase history, merged with other devices through an optional sync folder
+        self.device_id = self.settings.value("device_id", "", type=str)
+        if not self.device_id:
+            self.device_id = uuid.uuid4().hex[:12]
+            self.settings.setValue("device_id", self.device_id)
+        self.history = HistoryLog(
+            self.device_id,
+            get_data_directory(),
+            self.settings.value("sync_directory", "", type=str)
+        )
 
-        # Gamification tracking
+        # Chimes at phase boundaries (synthesized and decoded on a worker thread at startup)
+        self.sound_cues = SoundCuePlayer(
+            os.path.join(get_data_directory(), "sounds"),
+            enabled=self.settings.value("sound_cues_enabled", True, type=bool),
+            parent=self
+        )
+
+        # Gamification tracking (derived from the merged history)
         self.consecutive_cycles = 0  # Tracks completed work+rest cycles
         self.completed_cycles_today = 0
+        self.refresh_cycle_counters()
+
+        # Push and pull the sync folder off the GUI thread (every 5 minutes and on request)
+        self.sync_thread = HistorySyncThread(self.history)
+        self.sync_thread.synced.connect(self.handle_history_synced)
+        self.sync_thread.start()
 
         # Event-like object to stop threads
         from threading import Event
@@ -276,7 +1167,9 @@ class RestTimerApp(QMainWindow):
         self.timer_thread = None
 
         # Initialize inactivity detection
-        self.idle_thread = InactivityDetectionThread(idle_threshold=300)
+        self.idle_threshold = 300
+        self.user_idle = False  # True from the first idle report until activity resumes
+        self.idle_thread = InactivityDetectionThread(idle_threshold=self.idle_threshold)
         self.idle_thread.inactivity_detected.connect(self.handle_inactivity)
         self.idle_thread.start()
 
@@ -285,18 +1178,25 @@ class RestTimerApp(QMainWindow):
         self.setWindowFlags(self.windowFlags() | Qt.FramelessWindowHint)
 
         # Setup UI
+        self.color_animation = None
         self.setup_global_styles()
         self.initUI()
+        self.center_window()
 
         # Apply visual effects
         self.apply_fluent_effects()
 
+        # Release the widget tree once the window has been hidden for a while
+        self.teardown_timer = QTimer(self)
+        self.teardown_timer.setSingleShot(True)
+        self.teardown_timer.timeout.connect(self.release_ui)
+
         # Create system tray icon
         self.createTrayIcon()
         self.tray_icon.show()
 
-        # Initialize Rest Popup (hidden initially)
-        self.rest_popup = None
+        # Initialize Rest Overlay (hidden initially)
+        self.rest_overlay = None
 
         # Start the timer upon launch
         self.start_timer()
@@ -517,6 +1417,8 @@ class RestTimerApp(QMainWindow):
 
         self.stop_btn = QPushButton("Stop")
         self.stop_btn.clicked.connect(self.stop_timer)
+        if self.stop_disabled:
+            self.stop_btn.hide()
         btn_layout.addWidget(self.stop_btn)
 
         self.delete_stop_btn = QPushButton("Delete Stop")
@@ -529,7 +1431,6 @@ class RestTimerApp(QMainWindow):
         btn_layout.addWidget(self.hide_btn)
 
         main_layout.addWidget(buttons_group)
-        self.center_window()  # Center the window after initializing the UI
 
     # -----------------------------------------------
     # Tray Icon Creation
@@ -538,11 +1439,12 @@ class RestTimerApp(QMainWindow):
         self.tray_icon = QSystemTrayIcon(self)
         # Replace with a valid icon path or system theme icon
         self.tray_icon.setIcon(QIcon("icon.png"))
+        self.tray_icon.setToolTip("Rest Timer")
 
         self.tray_menu = QMenu(self)
 
         self.show_action = QAction("Show Window", self)
-        self.show_action.triggered.connect(self.show)
+        self.show_action.triggered.connect(self.show_window)
         self.tray_menu.addAction(self.show_action)
 
         self.stop_action = QAction("Stop Timer", self)
@@ -553,6 +1455,20 @@ class RestTimerApp(QMainWindow):
         self.restart_action.triggered.connect(self.restart_timer)
         self.tray_menu.addAction(self.restart_action)
 
+        self.sync_folder_action = QAction("Sync Folder...", self)
+        self.sync_folder_action.triggered.connect(self.choose_sync_directory)
+        self.tray_menu.addAction(self.sync_folder_action)
+
+        self.statistics_action = QAction("Statistics", self)
+        self.statistics_action.triggered.connect(self.show_statistics)
+        self.tray_menu.addAction(self.statistics_action)
+
+        self.sound_action = QAction("Sound Cues", self)
+        self.sound_action.setCheckable(True)
+        self.sound_action.setChecked(self.sound_cues.enabled)
+        self.sound_action.toggled.connect(self.toggle_sound_cues)
+        self.tray_menu.addAction(self.sound_action)
+
         self.quit_action = QAction("Quit", self)
         self.quit_action.triggered.connect(self.quit_application)
         self.tray_menu.addAction(self.quit_action)
@@ -567,6 +1483,9 @@ class RestTimerApp(QMainWindow):
         if not self.stop_disabled:
             self.tray_menu.addAction(self.stop_action)
         self.tray_menu.addAction(self.restart_action)
+        self.tray_menu.addAction(self.sync_folder_action)
+        self.tray_menu.addAction(self.statistics_action)
+        self.tray_menu.addAction(self.sound_action)
         self.tray_menu.addAction(self.quit_action)
 
     # -----------------------------------------------
@@ -578,6 +1497,7 @@ class RestTimerApp(QMainWindow):
 
         self.stop_event.clear()
         self.timer_running = True
+        self.phase_started_at = time.time()
 
         duration = self.work_duration if self.is_work_phase else self.rest_duration
         self.timer_thread = TimerThread(duration, self.stop_event)
@@ -586,8 +1506,13 @@ class RestTimerApp(QMainWindow):
         self.timer_thread.stopped.connect(self.handle_stop)
         self.timer_thread.start()
 
-        self.progress_bar.setMaximum(duration * 60)
-        self.progress_bar.setValue(duration * 60)
+        self.phase_seconds = duration * 60
+        self.remaining_seconds = self.phase_seconds
+        if self.central_widget is None:
+            return  # Tray-only mode: show_window() restores the display
+
+        self.progress_bar.setMaximum(self.phase_seconds)
+        self.progress_bar.setValue(self.phase_seconds)
 
         self.update_phase_label()
         self.smooth_color_transition()
@@ -595,6 +1520,7 @@ class RestTimerApp(QMainWindow):
     def stop_timer(self):
         if not self.timer_running:
             return
+        self.record_phase("stopped")
         self.stop_event.set()
         self.timer_running = False
 
@@ -608,18 +1534,23 @@ class RestTimerApp(QMainWindow):
     # Timer Callbacks
     # -----------------------------------------------
     def update_timer_display(self, remaining_seconds):
+        self.remaining_seconds = remaining_seconds
+        if self.central_widget is None:
+            return
         minutes, seconds = divmod(remaining_seconds, 60)
         self.countdown_label.setText(f"{minutes:02}:{seconds:02}")
         self.progress_bar.setValue(remaining_seconds)
 
-    def handle_phase_completion(self):
+    def handle_phase_completion(self, completed_at):
+        # Cue the next phase before anything else: history I/O and message boxes can wait
+        self.sound_cues.play("rest" if self.is_work_phase else "work", completed_at)
+
+        self.record_phase("completed")
         self.is_work_phase = not self.is_work_phase
         self.timer_running = False
 
         # If we just finished rest, a full cycle is complete
         if self.is_work_phase:
-            self.consecutive_cycles += 1
-            self.completed_cycles_today += 1
             self.check_achievements()
 
         self.show_phase_notification()
@@ -628,6 +1559,9 @@ class RestTimerApp(QMainWindow):
     def handle_stop(self):
         # Timer was manually stopped
         self.timer_running = False
+        self.remaining_seconds = None
+        if self.central_widget is None:
+            return
         self.countdown_label.setText("--:--")
         self.progress_bar.setValue(0)
 
@@ -641,15 +1575,18 @@ class RestTimerApp(QMainWindow):
 
     def show_phase_notification(self):
         if self.is_work_phase:
-            # Closed the popup if it exists
-            if self.rest_popup and self.rest_popup.isVisible():
-                self.rest_popup.close()
+            # Close the overlay if it exists
+            if self.rest_overlay and self.rest_overlay.isVisible():
+                self.rest_overlay.close()
 
             QMessageBox.information(self, "Work Phase", "Break time is over! Back to work.")
         else:
-            # Show the rest popup
-            self.rest_popup = RestPopup(self.rest_duration)
-            self.rest_popup.show()
+            # Cover every screen with the rest overlay, replacing one still up
+            # from an earlier rest (e.g. after a restart during the break)
+            if self.rest_overlay and self.rest_overlay.isVisible():
+                self.rest_overlay.close()
+            self.rest_overlay = RestOverlay(self.rest_duration)
+            self.rest_overlay.show()
 
     # -----------------------------------------------
     # Smooth Color Transition (Dynamic Timer)
@@ -683,6 +1620,10 @@ class RestTimerApp(QMainWindow):
         self.settings.setValue("rest_duration", self.rest_duration)
 
 
+    def toggle_sound_cues(self, enabled):
+        self.sound_cues.enabled = enabled
+        self.settings.setValue("sound_cues_enabled", enabled)
+
     # -----------------------------------------------
     # Stop Button Deletion
     # -----------------------------------------------
@@ -702,9 +1643,66 @@ class RestTimerApp(QMainWindow):
     # Inactivity Handling
     # -----------------------------------------------
     def handle_inactivity(self, inactive):
-        if inactive and self.timer_running:
-            print("User inactive: resetting timer.")
+        if not inactive:
+            self.user_idle = False
+            return
+
+        if self.timer_running:
+            if not self.user_idle:
+                print("User inactive: resetting timer.")
+                # The last idle_threshold seconds of the phase were spent away
+                self.record_phase("reset", idle_seconds=self.idle_threshold)
+            else:
+                # Still away: the phase restarted on the previous report made no progress
+                self.phase_started_at = None
             self.restart_timer()
+        self.user_idle = True
+
+    # -----------------------------------------------
+    # Phase History & Multi-Device Sync
+    # -----------------------------------------------
+    def record_phase(self, outcome, idle_seconds=0):
+        """
+        Append the phase that just ended to the history (once per phase).
+        :param idle_seconds: Trailing time the user was away, not counted as progress.
+        """
+        if self.phase_started_at is None:
+            return
+        seconds = max(0, time.time() - self.phase_started_at - idle_seconds)
+        self.phase_started_at = None
+        if outcome == "stopped" and seconds < MIN_RECORDED_SECONDS:
+            return  # Stopped before any real progress, e.g. Restart clicked twice
+        self.history.append(
+            "work" if self.is_work_phase else "rest", outcome, seconds,
+            idle_seconds=idle_seconds if outcome == "reset" else None
+        )
+        self.refresh_cycle_counters()
+        self.sync_thread.request_sync()
+
+    def refresh_cycle_counters(self):
+        self.consecutive_cycles = self.history.streak()
+        self.completed_cycles_today = self.history.cycles_today()
+
+    def handle_history_synced(self, added, elapsed_ms):
+        log_event(f"History sync: merged {added} operation(s) in {elapsed_ms:.1f} ms.")
+        self.refresh_cycle_counters()
+
+    def choose_sync_directory(self):
+        directory = QFileDialog.getExistingDirectory(
+            self, "Choose a shared folder for history sync", self.history.sync_dir or ""
+        )
+        if not directory:
+            return
+        self.settings.setValue("sync_directory", directory)
+        self.history.sync_dir = directory
+        self.sync_thread.request_sync()
+
+    def show_statistics(self):
+        dialog = StatisticsDialog(get_data_directory(), self)
+        dialog.setAttribute(Qt.WA_DeleteOnClose)
+        self.sync_thread.synced.connect(dialog.refresh)  # Pick up other devices' new phases
+        self.sync_thread.request_sync()
+        dialog.show()
 
     # -----------------------------------------------
     # Gamification: Streaks & Achievements
@@ -717,6 +1715,79 @@ class RestTimerApp(QMainWindow):
                 f"You've completed {self.consecutive_cycles} consecutive cycles! 🔥"
             )
 
+    # -----------------------------------------------
+    # Tray-Only Mode (Release / Rebuild Window)
+    # -----------------------------------------------
+    def hideEvent(self, event):
+        super().hideEvent(event)
+        if self.ui_teardown_delay > 0 and self.central_widget is not None:
+            self.teardown_timer.start(self.ui_teardown_delay * 1000)
+
+    def release_ui(self):
+        """
+        Destroy the widget tree of the hidden window to save memory.
+        The timer threads, tray icon and settings keep running;
+        show_window() rebuilds the widgets from the current state.
+        """
+        if self.isVisible() or self.central_widget is None:
+            return
+
+        rss_before = get_process_rss()
+
+        if self.color_animation is not None:
+            self.color_animation.stop()
+            self.color_animation = None
+
+        # Deleting the central card also deletes its children and graphics effect
+        self.takeCentralWidget().deleteLater()
+        for name in (
+            "central_widget", "title_label", "countdown_label", "phase_label",
+            "progress_bar", "work_slider", "work_value_label", "rest_slider",
+            "rest_value_label", "start_btn", "restart_btn", "stop_btn",
+            "delete_stop_btn", "hide_btn"
+        ):
+            setattr(self, name, None)
+
+        # Measure once the deferred deletion has run
+        QTimer.singleShot(1000, lambda: self.report_rss_saved(rss_before))
+
+    def report_rss_saved(self, rss_before):
+        rss_after = get_process_rss()
+        saved = (rss_before - rss_after) / (1024 * 1024)
+        log_event(
+            f"Tray-only mode: UI released, RSS {rss_before / (1024 * 1024):.1f} MB -> "
+            f"{rss_after / (1024 * 1024):.1f} MB ({saved:.1f} MB saved)."
+        )
+        if self.central_widget is None:
+            self.tray_icon.setToolTip(f"Rest Timer (tray-only, {saved:.1f} MB saved)")
+
+    def show_window(self):
+        """Show the main window, rebuilding it first if tray-only mode released it."""
+        self.teardown_timer.stop()
+        if self.central_widget is None:
+            started = time.perf_counter()
+            self.initUI()
+            self.apply_fluent_effects()
+            self.restore_ui_state()
+            self.show()
+            elapsed_ms = (time.perf_counter() - started) * 1000
+            log_event(f"Tray-only mode: UI rebuilt in {elapsed_ms:.1f} ms.")
+            self.tray_icon.setToolTip("Rest Timer")
+        else:
+            self.show()
+        self.raise_()
+        self.activateWindow()
+
+    def restore_ui_state(self):
+        """Push the current timer state into freshly built widgets."""
+        if self.remaining_seconds is None:
+            self.countdown_label.setText("--:--")
+            self.progress_bar.setValue(0)
+        else:
+            self.progress_bar.setMaximum(self.phase_seconds)
+            self.update_timer_display(self.remaining_seconds)
+        self.update_phase_label()
+
     # -----------------------------------------------
     # Application Lifecycle
     # -----------------------------------------------
@@ -742,9 +1813,16 @@ class RestTimerApp(QMainWindow):
             self.idle_thread.stop()
             self.idle_thread.wait()
 
-        # Close the rest popup if it's open
-        if self.rest_popup and self.rest_popup.isVisible():
-            self.rest_popup.close()
+        if self.sound_cues.loader and self.sound_cues.loader.isRunning():
+            self.sound_cues.loader.wait()
+
+        if self.sync_thread.isRunning():
+            self.sync_thread.stop()
+            self.sync_thread.wait(3000)  # Don't hang on an unreachable sync folder
+
+        # Close the rest overlay if it's open
+        if self.rest_overlay and self.rest_overlay.isVisible():
+            self.rest_overlay.close()
 
         QApplication.instance().quit()
 
@@ -752,6 +1830,10 @@ class RestTimerApp(QMainWindow):
 # Run the Application
 # --------------------------------------------------
 if __name__ == "__main__":
+    # Report the focus statistics without starting the GUI
+    if "--stats" in sys.argv[1:]:
+        sys.exit(run_stats_command(sys.argv[sys.argv.index("--stats") + 1:]))
+
     app = QApplication(sys.argv)
 
     # Check if already set to startup